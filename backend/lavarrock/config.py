@@ -41,11 +41,13 @@ class Settings(BaseSettings):
     ollama_host: str = "http://localhost:11434"
     ollama_model: str = "llama3.1:latest"
     ollama_temperature: float = 0.7
+    ollama_keep_alive: str = "10m"
 
     # Bedrock settings
     bedrock_region: str = "us-west-2"
     bedrock_model: str = "anthropic.claude-sonnet-4-20250514-v1:0"
     bedrock_temperature: float = 0.3
+    bedrock_profile: str | None = None
 
     # Database
     database_url: str = "sqlite:///./lavarrock.db"
@@ -58,4 +60,6 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
+# Built once at import time (reads env and .env a single time).
+# Import this instance instead of constructing Settings() again.
 settings = Settings()
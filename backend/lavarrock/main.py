@@ -1,19 +1,29 @@
 """Lavarrock backend - FastAPI application entry point."""
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from dotenv import load_dotenv
 from lavarrock.routes import themes
 from lavarrock.routes import config as config_routes
 
-load_dotenv()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown."""
+    print("🚀 Lavarrock backend starting...")
+    yield
+    print("🛑 Lavarrock backend shutting down...")
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Lavarrock",
     description="Self-hosted Obsidian-style AI copilot editor",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -21,8 +31,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://localhost:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "If-None-Match", "Authorization"],
+    max_age=86400,
 )
 
 # Include routers
@@ -36,20 +47,15 @@ async def health_check():
     return {"status": "ok", "version": "0.1.0"}
 
 
-# Health check startup
-@app.on_event("startup")
-async def startup_event():
-    """Application startup."""
-    print("🚀 Lavarrock backend starting...")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown."""
-    print("🛑 Lavarrock backend shutting down...")
-
-
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers need the import-string form so uvicorn can spawn processes.
+    # loop/http stay "auto", which picks uvloop and httptools when installed.
+    uvicorn.run(
+        "lavarrock.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=min(4, os.cpu_count() or 1),
+        log_level="info",
+    )
@@ -1,7 +1,60 @@
 """Model provider factory for supporting multiple LLM providers."""
+import functools
 from typing import Any, Union
 from lavarrock.config import OllamaConfig, BedrockConfig, Settings
 
+# Optional provider dependencies, resolved once at import time.
+# A None sentinel means the dependency is not installed.
+try:
+    from strands.models.ollama import OllamaModel as _OllamaModel
+except ImportError:
+    _OllamaModel = None
+
+try:
+    from strands.models import BedrockModel as _BedrockModel
+except ImportError:
+    _BedrockModel = None
+
+try:
+    import boto3 as _boto3
+except ImportError:
+    _boto3 = None
+
+
+@functools.lru_cache(maxsize=8)
+def _get_boto_session(region: str, profile: str | None) -> Any:
+    """Return a shared boto3 Session per (region, profile)."""
+    return _boto3.Session(profile_name=profile, region_name=region)
+
+
+# The values below come from the already-validated Settings singleton, so
+# the provider configs are built with model_construct to skip validation
+# and a second environment scan.
+@functools.lru_cache(maxsize=8)
+def _ollama_config(
+    host: str, model_id: str, temperature: float, keep_alive: str
+) -> OllamaConfig:
+    """Build (once per distinct settings) the Ollama provider config."""
+    return OllamaConfig.model_construct(
+        host=host,
+        model_id=model_id,
+        temperature=temperature,
+        keep_alive=keep_alive,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _bedrock_config(
+    model_id: str, region: str, temperature: float, profile: str | None
+) -> BedrockConfig:
+    """Build (once per distinct settings) the Bedrock provider config."""
+    return BedrockConfig.model_construct(
+        model_id=model_id,
+        region=region,
+        temperature=temperature,
+        profile=profile,
+    )
+
 
 class ModelFactory:
     """Factory for creating model instances from configuration."""
@@ -40,13 +93,10 @@ class ModelFactory:
     @staticmethod
     def _create_ollama_model(config: OllamaConfig) -> Any:
         """Create Ollama model instance."""
-        # Import here to avoid hard dependency on Ollama
-        try:
-            from strands.models.ollama import OllamaModel
-        except ImportError:
+        if _OllamaModel is None:
             raise ImportError("Ollama support requires 'strands-agents[ollama]' to be installed")
 
-        return OllamaModel(
+        return _OllamaModel(
             host=config.host,
             model_id=config.model_id,
             temperature=config.temperature,
@@ -56,11 +106,7 @@ class ModelFactory:
     @staticmethod
     def _create_bedrock_model(config: BedrockConfig) -> Any:
         """Create Bedrock model instance."""
-        # Import here to avoid hard dependency on AWS
-        try:
-            from strands.models import BedrockModel
-            import boto3
-        except ImportError:
+        if _BedrockModel is None or _boto3 is None:
             raise ImportError(
                 "Bedrock support requires 'strands-agents[bedrock]' and 'boto3' to be installed"
             )
@@ -70,10 +116,10 @@ class ModelFactory:
             client_kwargs["region_name"] = config.region
         
         if config.profile:
-            session = boto3.Session(profile_name=config.profile)
+            session = _get_boto_session(config.region, config.profile)
             client_kwargs["client"] = session.client("bedrock-runtime")
 
-        return BedrockModel(
+        return _BedrockModel(
             model_id=config.model_id,
             temperature=config.temperature,
             streaming=True,
@@ -84,16 +130,18 @@ class ModelFactory:
     def create_from_settings(settings: Settings) -> Any:
         """Create model instance from application settings."""
         if settings.ai_provider == "ollama":
-            config = OllamaConfig(
-                host=settings.ollama_host,
-                model_id=settings.ollama_model,
-                temperature=settings.ollama_temperature,
+            config = _ollama_config(
+                settings.ollama_host,
+                settings.ollama_model,
+                settings.ollama_temperature,
+                settings.ollama_keep_alive,
             )
         elif settings.ai_provider == "bedrock":
-            config = BedrockConfig(
-                model_id=settings.bedrock_model,
-                region=settings.bedrock_region,
-                temperature=settings.bedrock_temperature,
+            config = _bedrock_config(
+                settings.bedrock_model,
+                settings.bedrock_region,
+                settings.bedrock_temperature,
+                settings.bedrock_profile,
             )
         else:
             raise ValueError(f"Unsupported AI provider: {settings.ai_provider}")
@@ -6,93 +6,204 @@ Stores config in a JSON file at ~/.lavarrock/plugin_config.json
 so it persists across container restarts (the volume is mounted).
 """
 
-import json
+import copy
 import os
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from lavarrock.storage import (
+    atomic_write_bytes,
+    file_lock,
+    not_modified,
+    revalidation_headers,
+    weak_etag,
+)
 
 router = APIRouter(prefix="/api/config", tags=["config"])
 
 # ── Storage path ───────────────────────────────────
 CONFIG_DIR = Path(os.environ.get("LAVARROCK_DATA_DIR", os.path.expanduser("~/.lavarrock")))
 CONFIG_FILE = CONFIG_DIR / "plugin_config.json"
+# Sidecar lock serializing config writes across worker processes
+CONFIG_LOCK_FILE = CONFIG_DIR / ".plugin_config.lock"
+
+# Set once CONFIG_DIR has been created, so writes skip the mkdir syscall
+_config_dir_ready = False
 
 # ── Default plugin configuration ──────────────────
 # These plugins are enabled out of the box.
+DEFAULT_PLUGIN_IDS: tuple[str, ...] = (
+    "lavarrock.ui",
+    "lavarrock.wm",
+    "lavarrock.tooltips",
+    "lavarrock.header",
+    "lavarrock.search-modal",
+    "lavarrock.app-modal",
+    "lavarrock.search-bar",
+    "lavarrock.app-launcher",
+    "lavarrock.json-tool",
+    "lavarrock.theme-engine",
+    "lavarrock.theme-manager",
+    "lavarrock.theme-import",
+    "lavarrock.layout-engine",
+    "lavarrock.settings-engine",
+    "lavarrock.layout-manager",
+    "lavarrock.settings-manager",
+)
+
+# Internally plugins are indexed by id for O(1) lookup. On disk and over
+# the API they stay a list of {"id", "enabled", "settings"} entries.
+# Treat this as a read-only template; deepcopy it before mutating.
 DEFAULT_CONFIG: dict[str, Any] = {
-    "plugins": [
-        {"id": "lavarrock.ui", "enabled": True, "settings": {}},
-        {"id": "lavarrock.wm", "enabled": True, "settings": {}},
-        {"id": "lavarrock.tooltips", "enabled": True, "settings": {}},
-        {"id": "lavarrock.header", "enabled": True, "settings": {}},
-        {"id": "lavarrock.search-modal", "enabled": True, "settings": {}},
-        {"id": "lavarrock.app-modal", "enabled": True, "settings": {}},
-        {"id": "lavarrock.search-bar", "enabled": True, "settings": {}},
-        {"id": "lavarrock.app-launcher", "enabled": True, "settings": {}},
-        {"id": "lavarrock.json-tool", "enabled": True, "settings": {}},
-        {"id": "lavarrock.theme-engine", "enabled": True, "settings": {}},
-        {"id": "lavarrock.theme-manager", "enabled": True, "settings": {}},
-        {"id": "lavarrock.theme-import", "enabled": True, "settings": {}},
-        {"id": "lavarrock.layout-engine", "enabled": True, "settings": {}},
-        {"id": "lavarrock.settings-engine", "enabled": True, "settings": {}},
-        {"id": "lavarrock.layout-manager", "enabled": True, "settings": {}},
-        {"id": "lavarrock.settings-manager", "enabled": True, "settings": {}},
-    ],
+    "plugins": {
+        pid: {"id": pid, "enabled": True, "settings": {}} for pid in DEFAULT_PLUGIN_IDS
+    },
 }
 
+# Plugin ids PATCH may add to the config; anything else must arrive via PUT
+_KNOWN_PLUGIN_IDS: frozenset[str] = frozenset(DEFAULT_CONFIG["plugins"])
+
+
+def _is_plugin_entry(entry: Any) -> bool:
+    """Whether a list-form plugin entry is an object with a string id."""
+    return isinstance(entry, dict) and isinstance(entry.get("id"), str)
+
+
+def _index_config(config: dict[str, Any]) -> dict[str, Any]:
+    """Convert the on-disk/API list form into the id-indexed form.
+
+    Malformed entries are skipped so a hand-edited config file can never
+    break reads; if an id repeats, the last entry wins.
+    """
+    plugins = config.get("plugins", [])
+    if not isinstance(plugins, list):
+        plugins = []
+    return {
+        **config,
+        "plugins": {entry["id"]: entry for entry in plugins if _is_plugin_entry(entry)},
+    }
+
 
-def _read_config() -> dict[str, Any]:
-    """Read config from disk, falling back to defaults."""
-    if CONFIG_FILE.exists():
+def _serialize_config(config: dict[str, Any]) -> dict[str, Any]:
+    """Convert the id-indexed form back into the on-disk/API list form."""
+    return {**config, "plugins": list(config["plugins"].values())}
+
+
+# ── In-memory cache ────────────────────────────────
+# Parsed (id-indexed) config keyed on the file's (mtime_ns, size), so
+# steady-state reads cost a single stat() instead of a read + parse.
+_cache: dict[str, Any] = {"key": None, "value": None}
+
+
+def _read_config(use_cache: bool = True) -> dict[str, Any]:
+    """Read the id-indexed config from disk, falling back to defaults.
+
+    Pass ``use_cache=False`` under CONFIG_LOCK_FILE before a read-modify-write,
+    so a write from another worker within the same mtime tick isn't missed.
+    """
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return copy.deepcopy(DEFAULT_CONFIG)
+
+    key = (st.st_mtime_ns, st.st_size)
+    if not use_cache or _cache["key"] != key:
         try:
-            return json.loads(CONFIG_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
-            pass
-    return DEFAULT_CONFIG.copy()
+            raw = orjson.loads(CONFIG_FILE.read_bytes())
+        except (orjson.JSONDecodeError, OSError):
+            return copy.deepcopy(DEFAULT_CONFIG)
+        if not isinstance(raw, dict):
+            return copy.deepcopy(DEFAULT_CONFIG)
+        value = _index_config(raw)
+        _cache["key"] = key
+        _cache["value"] = value
+    return copy.deepcopy(_cache["value"])
 
 
 def _write_config(config: dict[str, Any]) -> None:
-    """Persist config to disk."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    CONFIG_FILE.write_text(json.dumps(config, indent=2))
+    """Persist an id-indexed config to disk."""
+    global _config_dir_ready
+    if not _config_dir_ready:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _config_dir_ready = True
+    data = orjson.dumps(_serialize_config(config), option=orjson.OPT_INDENT_2)
+    try:
+        atomic_write_bytes(CONFIG_FILE, data)
+    except FileNotFoundError:
+        # Data directory was removed at runtime — recreate it and retry once
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(CONFIG_FILE, data)
+    st = os.stat(CONFIG_FILE)
+    _cache["key"] = (st.st_mtime_ns, st.st_size)
+    _cache["value"] = copy.deepcopy(config)
 
 
 # ── Routes ─────────────────────────────────────────
 
 @router.get("")
-async def get_config():
+async def get_config(request: Request, response: Response):
     """Return the current plugin configuration."""
-    return _read_config()
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return _serialize_config(_read_config())
+
+    etag = weak_etag(st)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(revalidation_headers(etag))
+    return _serialize_config(_read_config())
 
 
 @router.put("")
 async def put_config(body: dict[str, Any]):
     """Replace the entire plugin configuration."""
-    _write_config(body)
-    return body
+    plugins = body.get("plugins", [])
+    if not isinstance(plugins, list) or not all(_is_plugin_entry(p) for p in plugins):
+        raise HTTPException(
+            status_code=422,
+            detail="'plugins' must be a list of objects, each with a string 'id'",
+        )
+    config = _index_config(body)
+    with file_lock(CONFIG_LOCK_FILE):
+        _write_config(config)
+    return _serialize_config(config)
 
 
 @router.patch("/plugin/{plugin_id}")
 async def patch_plugin(plugin_id: str, body: dict[str, Any]):
     """Update settings for a single plugin (merge)."""
-    config = _read_config()
-    for entry in config.get("plugins", []):
-        if entry["id"] == plugin_id:
-            entry["enabled"] = body.get("enabled", entry.get("enabled", True))
-            entry["settings"] = {
+    # Hold the lock across read-merge-write so concurrent PATCHes from
+    # other workers can't overwrite each other's changes
+    with file_lock(CONFIG_LOCK_FILE):
+        config = _read_config(use_cache=False)
+        plugins = config["plugins"]
+        entry = plugins.get(plugin_id)
+        if entry is not None:
+            old = (entry.get("enabled"), entry.get("settings"))
+            new_enabled = body.get("enabled", entry.get("enabled", True))
+            new_settings = {
                 **entry.get("settings", {}),
                 **body.get("settings", {}),
             }
-            _write_config(config)
+            entry["enabled"] = new_enabled
+            entry["settings"] = new_settings
+            # Skip the disk write when the patch changes nothing
+            if (new_enabled, new_settings) != old:
+                _write_config(config)
             return entry
-    # Plugin not in config yet — add it
-    new_entry = {
-        "id": plugin_id,
-        "enabled": body.get("enabled", True),
-        "settings": body.get("settings", {}),
-    }
-    config.setdefault("plugins", []).append(new_entry)
-    _write_config(config)
-    return new_entry
+        # Plugin not in config yet — add it if it's one we ship
+        if plugin_id not in _KNOWN_PLUGIN_IDS:
+            raise HTTPException(status_code=404, detail=f"Unknown plugin: {plugin_id}")
+        new_entry = {
+            "id": plugin_id,
+            "enabled": body.get("enabled", True),
+            "settings": body.get("settings", {}),
+        }
+        plugins[plugin_id] = new_entry
+        _write_config(config)
+        return new_entry
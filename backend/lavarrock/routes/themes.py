@@ -1,110 +1,208 @@
 """Theme management routes."""
-import json
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from lavarrock.storage import (
+    atomic_write_bytes,
+    not_modified,
+    revalidation_headers,
+    weak_etag,
+)
 
 router = APIRouter(prefix="/api/themes", tags=["themes"])
 
 # Store themes in user's home directory
 THEMES_DIR = Path.home() / ".lavarrock" / "themes"
 THEMES_DIR.mkdir(parents=True, exist_ok=True)
+# String form for hot-path os.* calls, avoiding per-request Path objects
+THEMES_DIR_STR = str(THEMES_DIR)
 ACTIVE_THEME_FILE = THEMES_DIR / "active_theme.json"
 
+# Bounded pool for blocking theme file reads
+_io_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="lavarrock-themes")
 
-class ThemeUpload(BaseModel):
-    """Theme upload model."""
-    name: str
-    theme: dict
+# Active theme name keyed on the active file's (mtime_ns, size)
+_active_cache: dict = {"key": None, "name": None}
 
 
-class ThemeResponse(BaseModel):
-    """Theme response model."""
-    name: str
-    theme: dict
-    active: bool
+def _get_active_name() -> Optional[str]:
+    """Return the active theme name, re-reading the file only when it changes."""
+    try:
+        st = os.stat(ACTIVE_THEME_FILE)
+    except FileNotFoundError:
+        _active_cache["key"] = None
+        _active_cache["name"] = None
+        return None
+    
+    key = (st.st_mtime_ns, st.st_size)
+    if _active_cache["key"] != key:
+        try:
+            active_data = orjson.loads(ACTIVE_THEME_FILE.read_bytes())
+        except FileNotFoundError:
+            return None
+        _active_cache["name"] = active_data.get("name")
+        _active_cache["key"] = key
+    return _active_cache["name"]
+
+
+def _load_theme(path: str, name: str) -> tuple[str, dict]:
+    """Read and parse a single theme file."""
+    with open(path, "rb") as f:
+        return name, orjson.loads(f.read())
+
 
+# Body is parsed by hand in upload_theme, so declare its schema for OpenAPI
+_THEME_UPLOAD_BODY = {
+    "required": True,
+    "content": {
+        "application/json": {
+            "schema": {
+                "type": "object",
+                "required": ["name", "theme"],
+                "properties": {
+                    "name": {"type": "string", "title": "Name"},
+                    "theme": {"type": "object", "title": "Theme"},
+                },
+            },
+        },
+    },
+}
 
-@router.post("", response_model=ThemeResponse)
-async def upload_theme(theme_data: ThemeUpload):
-    """Upload and save a VSCode theme."""
+
+@router.post("", openapi_extra={"requestBody": _THEME_UPLOAD_BODY})
+async def upload_theme(request: Request):
+    """Upload and save a VSCode theme.
+    
+    Expects a JSON body of the form ``{"name": str, "theme": dict}``.
+    The body is parsed once with orjson rather than through a Pydantic model.
+    """
+    try:
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid JSON body: {str(e)}")
+    
+    name = payload.get("name") if isinstance(payload, dict) else None
+    theme = payload.get("theme") if isinstance(payload, dict) else None
+    if not isinstance(name, str) or not isinstance(theme, dict):
+        raise HTTPException(
+            status_code=422,
+            detail="Body must be an object with a string 'name' and an object 'theme'",
+        )
+    
     try:
         # Save theme file
-        theme_file = THEMES_DIR / f"{theme_data.name}.json"
-        with open(theme_file, "w") as f:
-            json.dump(theme_data.theme, f, indent=2)
+        theme_path = os.path.join(THEMES_DIR_STR, f"{name}.json")
+        atomic_write_bytes(theme_path, orjson.dumps(theme, option=orjson.OPT_INDENT_2))
         
         # Set as active theme
-        with open(ACTIVE_THEME_FILE, "w") as f:
-            json.dump({"name": theme_data.name}, f)
+        atomic_write_bytes(ACTIVE_THEME_FILE, orjson.dumps({"name": name}))
+        st = os.stat(ACTIVE_THEME_FILE)
+        _active_cache["key"] = (st.st_mtime_ns, st.st_size)
+        _active_cache["name"] = name
         
-        return ThemeResponse(
-            name=theme_data.name,
-            theme=theme_data.theme,
-            active=True
+        return Response(
+            content=orjson.dumps({"name": name, "theme": theme, "active": True}),
+            media_type="application/json",
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save theme: {str(e)}")
 
 
-@router.get("/active", response_model=Optional[ThemeResponse])
-async def get_active_theme():
+@router.get("/active")
+async def get_active_theme(request: Request):
     """Get the currently active theme."""
     try:
-        if not ACTIVE_THEME_FILE.exists():
-            return None
-        
-        with open(ACTIVE_THEME_FILE, "r") as f:
-            active_data = json.load(f)
-        
-        theme_name = active_data.get("name")
+        theme_name = _get_active_name()
         if not theme_name:
             return None
         
-        theme_file = THEMES_DIR / f"{theme_name}.json"
-        if not theme_file.exists():
+        theme_path = os.path.join(THEMES_DIR_STR, f"{theme_name}.json")
+        try:
+            st = os.stat(theme_path)
+        except FileNotFoundError:
             return None
         
-        with open(theme_file, "r") as f:
-            theme = json.load(f)
+        # The body embeds the name from the active pointer, so key on it too
+        etag = weak_etag(st, salt=theme_name)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
         
-        return ThemeResponse(
-            name=theme_name,
-            theme=theme,
-            active=True
+        # Splice the stored bytes into the envelope instead of parsing and
+        # re-serializing them. Files may predate atomic writes or be dropped
+        # in by hand, so reject anything that isn't a complete JSON object
+        # rather than emitting a malformed body.
+        try:
+            with open(theme_path, "rb") as f:
+                theme_bytes = f.read().strip()
+        except FileNotFoundError:
+            return None
+        if not theme_bytes:
+            return None
+        if theme_bytes[:1] != b"{" or theme_bytes[-1:] != b"}":
+            raise ValueError(f"{theme_name}.json is not a complete JSON object")
+        body = b"".join((
+            b'{"name":', orjson.dumps(theme_name),
+            b',"theme":', theme_bytes,
+            b',"active":true}',
+        ))
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers=revalidation_headers(etag),
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load theme: {str(e)}")
 
 
-@router.get("", response_model=list[ThemeResponse])
+@router.get("/active/raw")
+async def get_active_theme_raw():
+    """Serve the active theme's JSON file as-is."""
+    theme_name = _get_active_name()
+    if not theme_name:
+        raise HTTPException(status_code=404, detail="No active theme")
+    
+    theme_path = os.path.join(THEMES_DIR_STR, f"{theme_name}.json")
+    try:
+        st = os.stat(theme_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Theme not found")
+    
+    # Hand over the stat result so FileResponse doesn't stat again
+    return FileResponse(theme_path, media_type="application/json", stat_result=st)
+
+
+@router.get("")
 async def list_themes():
     """List all available themes."""
     try:
-        active_name = None
-        if ACTIVE_THEME_FILE.exists():
-            with open(ACTIVE_THEME_FILE, "r") as f:
-                active_data = json.load(f)
-                active_name = active_data.get("name")
+        active_name = _get_active_name()
         
-        themes = []
-        for theme_file in THEMES_DIR.glob("*.json"):
-            if theme_file.name == "active_theme.json":
-                continue
-            
-            with open(theme_file, "r") as f:
-                theme = json.load(f)
-            
-            theme_name = theme_file.stem
-            themes.append(ThemeResponse(
-                name=theme_name,
-                theme=theme,
-                active=(theme_name == active_name)
-            ))
+        with os.scandir(THEMES_DIR) as it:
+            entries = [
+                (entry.path, entry.name[:-5])
+                for entry in it
+                if entry.name.endswith(".json")
+                and entry.name != "active_theme.json"
+                and entry.is_file(follow_symlinks=False)
+            ]
         
-        return themes
+        # Read theme files concurrently so disk latency overlaps
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(_io_executor, _load_theme, path, name)
+            for path, name in entries
+        ))
+        
+        return [
+            {"name": theme_name, "theme": theme, "active": theme_name == active_name}
+            for theme_name, theme in results
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list themes: {str(e)}")
 
@@ -113,18 +211,17 @@ async def list_themes():
 async def delete_theme(theme_name: str):
     """Delete a theme."""
     try:
-        theme_file = THEMES_DIR / f"{theme_name}.json"
-        if not theme_file.exists():
+        theme_path = os.path.join(THEMES_DIR_STR, f"{theme_name}.json")
+        try:
+            os.unlink(theme_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Theme not found")
         
-        theme_file.unlink()
-        
         # Clear active theme if it was deleted
-        if ACTIVE_THEME_FILE.exists():
-            with open(ACTIVE_THEME_FILE, "r") as f:
-                active_data = json.load(f)
-            if active_data.get("name") == theme_name:
-                ACTIVE_THEME_FILE.unlink()
+        if _get_active_name() == theme_name:
+            ACTIVE_THEME_FILE.unlink(missing_ok=True)
+            _active_cache["key"] = None
+            _active_cache["name"] = None
         
         return {"message": "Theme deleted successfully"}
     except HTTPException:
@@ -0,0 +1,97 @@
+"""Shared file storage helpers."""
+import os
+import tempfile
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from fastapi import Request, Response
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write_bytes(path: str | Path, data: bytes) -> None:
+    """Atomically replace ``path`` with ``data``.
+
+    Writes to a uniquely named temp file in the same directory, then
+    ``os.replace``s it into place, so concurrent writers (e.g. several
+    uvicorn workers) never share a temp file and readers never see a
+    partial write. The temp file is removed if anything fails.
+    """
+    path = os.fspath(path)
+    directory, name = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates 0600 files; apply the mode a plain open() would get
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+@contextmanager
+def file_lock(path: str | Path) -> Iterator[None]:
+    """Hold an exclusive inter-process lock on ``path`` (a sidecar lock file).
+
+    Serializes read-modify-write cycles across uvicorn worker processes.
+    The lock file's directory is created if it has gone missing.
+    """
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(os.fspath(path)), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+def weak_etag(st: os.stat_result, salt: str = "") -> str:
+    """Build a weak ETag from a file's mtime and size.
+
+    ``salt`` folds in anything else the response depends on (e.g. the
+    theme name), so two files with identical stats still validate apart.
+    """
+    tag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    if salt:
+        tag += f"-{zlib.crc32(salt.encode()):x}"
+    return f'W/"{tag}"'
+
+
+def revalidation_headers(etag: str) -> dict[str, str]:
+    """Headers telling clients to revalidate every time using ``etag``."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """Return a 304 response if the client already holds ``etag``, else None."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=revalidation_headers(etag))
+    return None